@@ -1,12 +1,47 @@
 import os
 import asyncio
+from importlib.metadata import version
 from playwright.async_api import async_playwright
 
+# The resolved path is cached in memory and on disk, so later calls and later runs
+# skip starting Playwright. The disk cache is keyed by the Playwright version,
+# because every release expects its own Chromium build.
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "atlas", "chromium_path")
+_chromium_path = None
+
+def _read_cached_path():
+    """
+    Returns the cached Chromium path if it was stored by the installed Playwright
+    version and the binary still exists, otherwise None.
+    """
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            cached_version, cached_path = f.read().splitlines()[:2]
+    except (OSError, ValueError):
+        return None
+    if cached_version == version("playwright") and os.path.exists(cached_path):
+        return cached_path
+    return None
+
+def _write_cached_path(chromium_path):
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            f.write(f"{version('playwright')}\n{chromium_path}\n")
+    except OSError:
+        pass
+
 async def get_playwright_chromium_path():
     """
     Uses Playwright's async API to obtain the path to the Chromium binary.
     If the binary is not present, installs it via Playwright.
     """
+    global _chromium_path
+    if _chromium_path is None:
+        _chromium_path = _read_cached_path()
+    if _chromium_path is not None:
+        return _chromium_path
+
     async with async_playwright() as p:
         chromium_path = p.chromium.executable_path
 
@@ -23,4 +58,7 @@ async def get_playwright_chromium_path():
             raise Exception(f"Playwright install failed: {stderr.decode()}")
         async with async_playwright() as p:
             chromium_path = p.chromium.executable_path
+
+    _chromium_path = chromium_path
+    _write_cached_path(chromium_path)
     return chromium_path
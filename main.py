@@ -9,38 +9,48 @@ import chrome_path_helper
 import web_scraper
 from urls import URLS
 
-def run_all_tasks():
-    logging.info("Starting all tasks...")
-
-    # 1. Run RSS metadata extraction.
-    logging.info("Running RSS metadata extraction...")
-    trafa_rss_metadata.main()
-
-    # 2. Run sitemap metadata extraction.
-    logging.info("Running sitemap metadata extraction...")
-    trafa_sitemap_metadata.main()
-
-    # 3. Run PDF crawler.
-    logging.info("Running PDF crawler...")
-    # Provide a default base URL for PDF crawling.
-    # Adjust this URL if you have a specific site in mind.
-    for target_url in URLS:
-        pdf_crawler.crawl_for_pdfs(target_url)
+async def run_stage(name, coro):
+    """
+    Awaits one scraper stage, logging instead of raising its errors so that a failing
+    stage does not cancel the others running alongside it.
+    """
+    logging.info(f"Running {name}...")
+    try:
+        await coro
+        logging.info(f"Finished {name}.")
+    except Exception as e:
+        logging.error(f"Error running {name}: {e}")
 
-    # 4. Retrieve the Chromium path using Playwright.
+async def run_web_scraper():
+    # Retrieve the Chromium path using Playwright.
     logging.info("Fetching Chromium path via Playwright...")
     try:
-        chromium_path = asyncio.run(chrome_path_helper.get_playwright_chromium_path())
+        chromium_path = await chrome_path_helper.get_playwright_chromium_path()
         logging.info(f"Chromium path: {chromium_path}")
     except Exception as e:
         logging.error(f"Error obtaining Chromium path: {e}")
 
-    # 5. Run the web scraper.
-    logging.info("Running web scraper...")
-    try:
-        asyncio.run(web_scraper.main())
-    except Exception as e:
-        logging.error(f"Error running web scraper: {e}")
+    # Run the web scraper.
+    await run_stage("web scraper", web_scraper.main())
+
+async def run_all_tasks():
+    logging.info("Starting all tasks...")
+
+    # The stages are independent I/O pipelines, so run them concurrently;
+    # total wall time is that of the slowest stage rather than the sum.
+    async with asyncio.TaskGroup() as tg:
+        # 1. RSS metadata extraction.
+        tg.create_task(run_stage("RSS metadata extraction", trafa_rss_metadata.main()))
+
+        # 2. Sitemap metadata extraction.
+        tg.create_task(run_stage("sitemap metadata extraction", trafa_sitemap_metadata.main()))
+
+        # 3. PDF crawler, one task per configured authority.
+        for target_url in URLS:
+            tg.create_task(run_stage(f"PDF crawler for {target_url}", pdf_crawler.crawl_for_pdfs(target_url)))
+
+        # 4. Chromium path lookup followed by the web scraper.
+        tg.create_task(run_web_scraper())
 
     logging.info("All tasks completed successfully.")
 
@@ -49,4 +59,4 @@ if __name__ == "__main__":
         level=logging.DEBUG,
         format="%(asctime)s - %(levelname)s - %(message)s"
     )
-    run_all_tasks()
+    asyncio.run(run_all_tasks())
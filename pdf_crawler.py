@@ -1,17 +1,36 @@
 import os
 import re
 import random
-import requests
+import asyncio
+import contextlib
+import aiohttp
+import aiofiles
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
 from urls import URLS
-from utils import USER_AGENTS
+from utils import USER_AGENTS, ensure_dir, rotate_user_agent
 
 DEBUG = False  # Toggle this to False to silence debug logs
 
+# A crawl stays on one host, so the connector's per-host limit is what bounds the
+# requests in flight; the page and download semaphores are kept equal to it so no
+# task holds a slot while it waits for a connection.
+MAX_CONNECTIONS_PER_HOST = 8
+CRAWL_CONCURRENCY = MAX_CONNECTIONS_PER_HOST     # Maximum number of pages fetched at once
+DOWNLOAD_CONCURRENCY = MAX_CONNECTIONS_PER_HOST  # Maximum number of PDFs downloaded at once
+CHUNK_SIZE = 65536         # Bytes written to disk per streamed chunk
+
+# Characters that are not allowed in folder or file names.
+_SANITIZE_RE = re.compile(r"[^\w\-.]")
+# Auto-generated numeric/hex pages ending with .html, e.g. "/12.706c70df.html".
+_NUMERIC_PAGE_RE = re.compile(r'^/\d+(\.[\da-f]+)?\.html$')
+# Links to PDF files, optionally followed by a query string or fragment.
+_PDF_SUFFIX_RE = re.compile(r'\.pdf($|[?#])', re.IGNORECASE)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=10, sock_read=10)
+
 def log_debug(message: str):
     if DEBUG:
         print(f"[DEBUG] {message}")
@@ -24,118 +43,182 @@ def sanitize_filename(name: str) -> str:
     hyphen, underscore, or period.
     """
     name = name.strip().replace(" ", "-")
-    return re.sub(r"[^\w\-.]", "", name)
+    return _SANITIZE_RE.sub("", name)
 
-def extract_section_name(link) -> str:
+def iter_links_with_sections(soup):
     """
-    Walks up the DOM tree from the given BeautifulSoup link element to find the nearest
-    heading (h1-h6) element and returns its text. Returns None if no heading is found.
+    Yields (link, section_name) for every <a href> element in the page, where section_name
+    is the text of the nearest non-empty heading (h1-h6) preceding the link in document
+    order, or None if there is none. Headings and links are visited in a single pass, so
+    resolving the section costs O(1) per link instead of a subtree scan per ancestor.
     """
-    parent = link.parent
-    while parent:
-        heading = parent.find(lambda tag: tag.name in ["h1", "h2", "h3", "h4", "h5", "h6"] and tag.get_text(strip=True))
-        if heading:
-            return heading.get_text(strip=True)
-        parent = parent.parent
-    return None
-
-def download_pdf(pdf_url: str, link, base_download_dir: str = "downloads"):
+    section_name = None
+    for tag in soup.find_all(["a", "h1", "h2", "h3", "h4", "h5", "h6"]):
+        if tag.name == "a":
+            if tag.get("href") is not None:
+                yield tag, section_name
+        else:
+            heading_text = tag.get_text(strip=True)
+            if heading_text:
+                section_name = heading_text
+
+def pdf_target(pdf_url: str, link_text: str, section: str):
     """
-    Downloads a PDF file from the given URL and stores it in a directory structured as:
-      SectionName/YYYY-MM-DD_HH-MM-SS/SubfolderName/PDFFile.pdf
-      
-    The section name is extracted from the nearest heading of the link element; if none is found,
-    "General" is used. The subfolder name is derived from the link text or PDF filename.
+    Returns the (section, subfolder, filename) names a PDF link is stored under. Links
+    with the same names end up in the same file, so the crawler downloads them once.
     """
-    section = extract_section_name(link) or "General"
-    section = sanitize_filename(section)
-    
-    subfolder = link.get_text(strip=True)
+    section = sanitize_filename(section or "General")
+
+    subfolder = link_text
     if not subfolder:
         subfolder = os.path.splitext(os.path.basename(pdf_url))[0]
     subfolder = sanitize_filename(subfolder)
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    download_dir = os.path.join(base_download_dir, section, timestamp, subfolder)
-    os.makedirs(download_dir, exist_ok=True)
-    
+
     pdf_filename = sanitize_filename(os.path.basename(pdf_url))
     if not pdf_filename.lower().endswith(".pdf"):
         pdf_filename += ".pdf"
+    return section, subfolder, pdf_filename
+
+async def download_pdf(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, pdf_url: str,
+                       link_text: str, section: str, timestamp: str, base_download_dir: str = "downloads"):
+    """
+    Downloads a PDF file from the given URL and stores it in a directory structured as:
+      SectionName/YYYY-MM-DD_HH-MM-SS/SubfolderName/PDFFile.pdf
+
+    The section name is the nearest heading before the link; if there is none, "General"
+    is used. The subfolder name is derived from the link text or PDF filename. The
+    timestamp identifies the crawl run, so all PDFs of one run share a folder.
+    The response is streamed to disk in chunks, and the semaphore bounds the number of
+    downloads in flight.
+    """
+    section, subfolder, pdf_filename = pdf_target(pdf_url, link_text, section)
+    download_dir = os.path.join(base_download_dir, section, timestamp, subfolder)
+    ensure_dir(download_dir)
     file_path = os.path.join(download_dir, pdf_filename)
     
-    headers = {"User-Agent": random.choice(USER_AGENTS)}
-    print(f"Downloading PDF: {pdf_url}")
-    try:
-        pdf_response = requests.get(pdf_url, headers=headers, timeout=10)
-        pdf_response.raise_for_status()
-        with open(file_path, "wb") as f:
-            f.write(pdf_response.content)
-        print(f"Saved PDF to {file_path}")
-    except Exception as e:
-        print(f"Error downloading {pdf_url}: {e}")
-
-def crawl_for_pdfs(base_url: str, base_download_dir: str = "downloads", max_depth: int = 3):
+    async with semaphore:
+        print(f"Downloading PDF: {pdf_url}")
+        rotate_user_agent(session)
+        # Stream into a .part file and move it into place only once the body is complete,
+        # so an interrupted download never leaves a truncated PDF behind.
+        temp_path = file_path + ".part"
+        try:
+            async with session.get(pdf_url) as pdf_response:
+                pdf_response.raise_for_status()
+                async with aiofiles.open(temp_path, "wb") as f:
+                    async for chunk in pdf_response.content.iter_chunked(CHUNK_SIZE):
+                        await f.write(chunk)
+            os.replace(temp_path, file_path)
+            print(f"Saved PDF to {file_path}")
+        except Exception as e:
+            print(f"Error downloading {pdf_url}: {e}")
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+
+async def fetch_page(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str):
+    """
+    Fetches a single page and returns (final_url, body, charset), or None if the request
+    fails or the response is not HTML. The body is left as raw bytes so the parser can
+    decode it natively; charset is the one declared in the Content-Type header, if any.
+    The semaphore bounds the number of requests in flight.
+    """
+    async with semaphore:
+        rotate_user_agent(session)
+        try:
+            async with session.get(url) as response:
+                for r in response.history:
+                    log_debug(f"Redirect: {r.status} -> {r.url}")
+                final_url = str(response.url)
+                log_debug(f"Final URL after redirects: {final_url}")
+
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if "text/html" not in content_type:
+                    log_debug(f"Skipping non-HTML content at {final_url} (Content-Type: {content_type})")
+                    return None
+                body = await response.read()
+        except Exception as e:
+            print(f"Failed to retrieve {url}: {e}")
+            return None
+
+    return final_url, body, response.charset
+
+async def crawl_for_pdfs(base_url: str, base_download_dir: str = "downloads", max_depth: int = 3):
     """
     Recursively crawls the site starting at base_url to find PDF files.
     
     This function:
       - Follows internal links within the same domain (up to max_depth levels).
+      - Fetches every page of a depth level concurrently over one pooled aiohttp session.
       - Processes only pages with an HTML content type.
-      - Decodes page content with errors replaced to avoid decoding warnings.
+      - Passes the raw page bytes to lxml, which detects the encoding natively.
       - Filters out auto-generated numeric/hex pages that tend to result in 404 errors.
+
+    Returns the list of (pdf_url, link_text, section_name) tuples that were found.
     """
-    visited = set()
-    to_visit = [(base_url, 0)]
+    base_netloc = urlparse(base_url).netloc
+    # Every URL ever queued, so each page is enqueued and fetched at most once.
+    seen = {base_url}
+    frontier = [base_url]
     pdf_links = []
-    
-    while to_visit:
-        current_url, depth = to_visit.pop(0)
-        if current_url in visited:
-            continue
-        visited.add(current_url)
-        headers = {"User-Agent": random.choice(USER_AGENTS)}
-        try:
-            response = requests.get(current_url, headers=headers, timeout=10)
-            for r in response.history:
-                log_debug(f"Redirect: {r.status_code} -> {r.url}")
-            final_url = response.url
-            log_debug(f"Final URL after redirects: {final_url}")
-
-            response.raise_for_status()
-            content_type = response.headers.get("Content-Type", "")
-            if "text/html" not in content_type:
-                log_debug(f"Skipping non-HTML content at {final_url} (Content-Type: {content_type})")
-                continue
-        except Exception as e:
-            print(f"Failed to retrieve {current_url}: {e}")
-            continue
-        
-        # Decode HTML content with errors replaced to prevent decoding warnings.
-        html_content = response.content.decode(response.encoding or 'utf-8', errors="replace")
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        for link in soup.find_all("a", href=True):
-            href = link.get("href")
-            full_url = urljoin(final_url, href)
-            
-            # Only follow links within the same domain.
-            if urlparse(full_url).netloc != urlparse(base_url).netloc:
-                continue
-            
-            # Filter out auto-generated numeric/hex pages ending with .html
-            parsed = urlparse(full_url)
-            if re.match(r'^/\d+(\.[\da-f]+)?\.html$', parsed.path):
-                continue
-            
-            if ".pdf" in full_url.lower():
-                pdf_links.append((full_url, link))
-            elif depth < max_depth and full_url not in visited:
-                to_visit.append((full_url, depth + 1))
-    
-    print(f"Found {len(pdf_links)} PDF links on the site.")
-    
-    # Use tqdm to show a progress bar for downloading PDFs.
-    for pdf_url, link in tqdm(pdf_links, desc="Downloading PDFs", unit="pdf"):
-        download_pdf(pdf_url, link, base_download_dir=base_download_dir)
+    # Storage targets already queued, so a PDF linked from several pages is fetched
+    # once rather than downloaded concurrently into the same file.
+    pdf_targets = set()
+
+    semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": random.choice(USER_AGENTS)},
+        timeout=REQUEST_TIMEOUT,
+    ) as session:
+        for depth in range(max_depth + 1):
+            if not frontier:
+                break
+
+            pages = await asyncio.gather(*(fetch_page(session, semaphore, url) for url in frontier))
+            next_frontier = []
+            for page in pages:
+                if page is None:
+                    continue
+                final_url, body, charset = page
+                soup = BeautifulSoup(body, "lxml", from_encoding=charset)
+
+                for link, section_name in iter_links_with_sections(soup):
+                    href = link.get("href")
+                    full_url = urljoin(final_url, href)
+
+                    # Only follow links within the same domain.
+                    parsed = urlparse(full_url)
+                    if parsed.netloc != base_netloc:
+                        continue
+
+                    # Filter out auto-generated numeric/hex pages ending with .html
+                    if _NUMERIC_PAGE_RE.match(parsed.path):
+                        continue
+
+                    if _PDF_SUFFIX_RE.search(full_url):
+                        link_text = link.get_text(strip=True)
+                        target = pdf_target(full_url, link_text, section_name)
+                        if target not in pdf_targets:
+                            pdf_targets.add(target)
+                            pdf_links.append((full_url, link_text, section_name))
+                    elif depth < max_depth and full_url not in seen:
+                        seen.add(full_url)
+                        next_frontier.append(full_url)
+            frontier = next_frontier
+
+        print(f"Found {len(pdf_links)} PDF links on the site.")
+
+        # Download all PDFs concurrently, with tqdm showing a progress bar.
+        download_semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        await tqdm_asyncio.gather(
+            *(download_pdf(session, download_semaphore, pdf_url, link_text, section_name, timestamp,
+                           base_download_dir=base_download_dir)
+              for pdf_url, link_text, section_name in pdf_links),
+            desc="Downloading PDFs",
+            unit="pdf",
+        )
 
+    return pdf_links
@@ -1,15 +1,28 @@
 import os
 import re
 import csv
+import random
+import asyncio
 import logging
-import requests
+import aiohttp
+import aiofiles
 import feedparser
 from datetime import datetime
 
+from utils import USER_AGENTS, ensure_dir, rotate_user_agent
+
 # Configure logging.
 logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
+MAX_CONNECTIONS_PER_HOST = 4  # Keep concurrent downloads polite towards trafa.se
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=10, sock_read=10)
+
+# PDF-style date digits "YYYYMMDDHHMMSS", e.g. from "D:20230424161144+02'00'".
+_PDF_DATE_RE = re.compile(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})")
+# Characters that are not allowed in file names.
+_FNAME_RE = re.compile(r'[\\/*?:"<>|]')
+
 def parse_date(date_value):
     """
     Parses date strings or datetime objects into "YYYY-MM-DD".
@@ -26,7 +39,7 @@ def parse_date(date_value):
         # If the string starts with D: (PDF style), try to parse similarly.
         if date_value.startswith("D:"):
             d = date_value[2:]
-            match = re.match(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})", d)
+            match = _PDF_DATE_RE.match(d)
             if match:
                 try:
                     dt = datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S")
@@ -40,34 +53,36 @@ def sanitize_filename(name):
     """
     Sanitizes a string to be used as a filename.
     """
-    return re.sub(r'[\\/*?:"<>|]', "_", name)
+    return _FNAME_RE.sub("_", name)
 
-def download_html(url, base_folder, year, filename_hint):
+async def download_html(session, url, base_folder, year, filename_hint):
     """
     Downloads the HTML content of the given URL and saves it in:
     base_folder/year/sanitized_filename.html
     """
+    rotate_user_agent(session)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            html = await response.text(errors="replace")
     except Exception as e:
         logging.error(f"Error downloading HTML from {url}: {e}")
         return None
 
     filename = sanitize_filename(filename_hint) + ".html"
     folder_path = os.path.join(base_folder, year)
-    os.makedirs(folder_path, exist_ok=True)
+    ensure_dir(folder_path)
     local_path = os.path.join(folder_path, filename)
     try:
-        with open(local_path, "w", encoding="utf-8") as f:
-            f.write(response.text)
+        async with aiofiles.open(local_path, "w", encoding="utf-8") as f:
+            await f.write(html)
         logging.info(f"Saved HTML to {local_path}")
         return local_path
     except Exception as e:
         logging.error(f"Error saving HTML file {local_path}: {e}")
         return None
 
-def process_rss_feed(feed_url):
+async def process_rss_feed(feed_url):
     """
     Processes the RSS feed and extracts metadata from each feed item.
     Fields extracted:
@@ -75,33 +90,53 @@ def process_rss_feed(feed_url):
       - Datum: From the feed item's published date (pubDate).
       - url: From the feed item's link.
     Also downloads the HTML of each feed item into a sorted folder structure.
+    The feed and all item pages share one pooled aiohttp session, and the item
+    pages are downloaded concurrently.
     """
-    feed = feedparser.parse(feed_url)
-    items = []
-    base_download_folder = "trafa_rss_downloads"
-    for entry in feed.entries:
-        dokumentnamn = entry.get("title", "N/A")
-        raw_date = entry.get("published", "Unknown")
-        datum = parse_date(raw_date)
-        url = entry.get("link", feed_url)
-        
-        # Determine year folder
-        year = datum.split("-")[0] if datum != "Unknown" else "unknown"
-        local_path = download_html(url, base_download_folder, year, dokumentnamn)
-        
-        metadata = {
-            "Dokumentnamn": dokumentnamn,
-            "Datum": datum,
-            "url": url,
-            "LocalPath": local_path
-        }
-        items.append(metadata)
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": random.choice(USER_AGENTS)},
+        timeout=REQUEST_TIMEOUT,
+    ) as session:
+        try:
+            async with session.get(feed_url) as response:
+                response.raise_for_status()
+                feed_content = await response.read()
+        except Exception as e:
+            logging.error(f"Error fetching RSS feed {feed_url}: {e}")
+            return []
+        feed = feedparser.parse(feed_content)
+
+        items = []
+        downloads = []
+        base_download_folder = "trafa_rss_downloads"
+        for entry in feed.entries:
+            dokumentnamn = entry.get("title", "N/A")
+            raw_date = entry.get("published", "Unknown")
+            datum = parse_date(raw_date)
+            url = entry.get("link", feed_url)
+            
+            # Determine year folder
+            year = datum.split("-")[0] if datum != "Unknown" else "unknown"
+            downloads.append(download_html(session, url, base_download_folder, year, dokumentnamn))
+            
+            metadata = {
+                "Dokumentnamn": dokumentnamn,
+                "Datum": datum,
+                "url": url,
+            }
+            items.append(metadata)
+
+        local_paths = await asyncio.gather(*downloads)
+    for metadata, local_path in zip(items, local_paths):
+        metadata["LocalPath"] = local_path
     logging.info(f"Processed {len(items)} items from RSS feed {feed_url}")
     return items
 
-def main():
+async def main():
     rss_feed_url = "https://www.trafa.se/kb-rss/"
-    items = process_rss_feed(rss_feed_url)
+    items = await process_rss_feed(rss_feed_url)
     
     output_file = "trafa_rss_metadata.csv"
     try:
@@ -109,11 +144,10 @@ def main():
             fieldnames = ["Dokumentnamn", "Datum", "url", "LocalPath"]
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            for item in items:
-                writer.writerow(item)
+            writer.writerows(items)
         logging.info(f"RSS metadata written to {output_file}")
     except Exception as e:
         logging.error(f"Error writing CSV file: {e}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,19 +1,38 @@
 import os
 import re
+import asyncio
 import csv
+import contextlib
 import logging
-import requests
-from io import BytesIO
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urlparse, unquote
 from datetime import datetime
 from usp.tree import sitemap_tree_for_homepage
 import PyPDF2
-from openpyxl import load_workbook
+from tqdm import tqdm
+
+from utils import create_session, ensure_dir, rotate_user_agent
 
 # Configure detailed logging.
 logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shared connection pool for all file downloads.
+SESSION = create_session()
+CHUNK_SIZE = 65536  # Bytes written to disk per streamed chunk
+MAX_WORKERS = 32    # Number of files downloaded and processed at once
+
+# PDF-style date digits "YYYYMMDDHHMMSS", e.g. from "D:20230424161144+02'00'".
+_PDF_DATE_RE = re.compile(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})")
+# Characters that are not allowed in file names.
+_FNAME_RE = re.compile(r'[\\/*?:"<>|]')
+# The creation date element in an Office document's docProps/core.xml.
+_XLSX_CREATED_TAG = "{http://purl.org/dc/terms/}created"
+
 # --- Helper Functions ---
 
 def parse_date(date_value):
@@ -30,7 +49,7 @@ def parse_date(date_value):
         if date_value.startswith("D:"):
             # Remove prefix and extract the first 14 digits.
             d = date_value[2:]
-            match = re.match(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})", d)
+            match = _PDF_DATE_RE.match(d)
             if match:
                 try:
                     dt = datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S")
@@ -52,34 +71,60 @@ def sanitize_filename(name):
     """
     Removes or replaces characters that are not allowed in file names.
     """
-    return re.sub(r'[\\/*?:"<>|]', "_", name)
+    return _FNAME_RE.sub("_", name)
 
-def download_file(url, base_folder, file_type, year):
+def stream_to_file(url, f):
     """
-    Downloads a file from the given URL and saves it in a folder structure:
-    base_folder/file_type/year/filename
-    Returns the local file path.
+    Streams the body of the given URL into the open binary file f in chunks,
+    so the whole file is never held in memory.
     """
-    try:
-        response = requests.get(url)
+    rotate_user_agent(SESSION)
+    with SESSION.get(url, stream=True) as response:
         response.raise_for_status()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            f.write(chunk)
+
+def download_file(url, folder):
+    """
+    Downloads a file from the given URL into a temporary file inside folder.
+    Returns the temporary file path; the caller reads its metadata and then moves it
+    into place with store_file(), so every file is only fetched once.
+    """
+    ensure_dir(folder)
+    # Exclusive create on a unique name; unlike mkstemp this honours the umask, so the
+    # stored file gets the same permissions as any other file written here.
+    temp_path = os.path.join(folder, f"{uuid.uuid4().hex}.part")
+    try:
+        with open(temp_path, "xb") as f:
+            stream_to_file(url, f)
+        return temp_path
     except Exception as e:
         logging.error(f"Error downloading file {url}: {e}")
+        # The temp file may never have been created, e.g. when open() itself failed.
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
         return None
 
+def store_file(temp_path, url, base_folder, file_type, year):
+    """
+    Moves a downloaded file into a folder structure:
+    base_folder/file_type/year/filename
+    Returns the local file path.
+    """
     parsed_url = urlparse(url)
     filename = os.path.basename(parsed_url.path)
     filename = sanitize_filename(unquote(filename))
     folder_path = os.path.join(base_folder, file_type, year)
-    os.makedirs(folder_path, exist_ok=True)
+    ensure_dir(folder_path)
     local_path = os.path.join(folder_path, filename)
     try:
-        with open(local_path, "wb") as f:
-            f.write(response.content)
+        os.replace(temp_path, local_path)
         logging.info(f"Saved file to {local_path}")
         return local_path
     except Exception as e:
         logging.error(f"Error saving file {local_path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
         return None
 
 # --- Extraction Functions for Sitemap Files ---
@@ -101,45 +146,41 @@ def extract_sitemap_metadata(page):
          'url': url
     }
 
-def extract_pdf_metadata(url):
+def extract_pdf_metadata(path):
     """
-    Downloads the PDF and extracts metadata using PyPDF2.
+    Extracts metadata from a downloaded PDF using PyPDF2.
+    Only the trailer's info dictionary is read; the page tree is never parsed, and
+    strict=False lets slightly malformed files through instead of failing validation.
     Returns a dict with:
       - Datum: Parsed creation date (if available)
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        pdf_file = BytesIO(response.content)
-        reader = PyPDF2.PdfReader(pdf_file)
-        info = reader.metadata
-        raw_date = info.get('/CreationDate', "Unknown")
+        with open(path, "rb") as pdf_file:
+            reader = PyPDF2.PdfReader(pdf_file, strict=False)
+            info = reader.metadata or {}
+            raw_date = info.get('/CreationDate', "Unknown")
         datum = parse_date(raw_date)
         return {"Datum": datum}
     except Exception as e:
-        logging.error(f"Error extracting PDF metadata from {url}: {e}")
+        logging.error(f"Error extracting PDF metadata from {path}: {e}")
         return {"Datum": "Unknown"}
 
-def extract_xlsx_metadata(url):
+def extract_xlsx_metadata(path):
     """
-    Downloads the XLSX file and extracts metadata using openpyxl.
+    Extracts metadata from a downloaded XLSX file. An XLSX file is a ZIP archive, so
+    only its docProps/core.xml entry is read; no workbook or worksheets are loaded.
     Returns a dict with:
       - Datum: Creation date property (if available)
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        temp_filename = "temp.xlsx"
-        with open(temp_filename, "wb") as f:
-            f.write(response.content)
-        wb = load_workbook(temp_filename, read_only=True)
-        props = wb.properties
-        raw_date = props.created if props.created else "Unknown"
+        with zipfile.ZipFile(path) as archive:
+            core = ET.fromstring(archive.read("docProps/core.xml"))
+        created = core.find(_XLSX_CREATED_TAG)
+        raw_date = created.text if created is not None and created.text else "Unknown"
         datum = parse_date(raw_date)
-        os.remove(temp_filename)
         return {"Datum": datum}
     except Exception as e:
-        logging.error(f"Error extracting XLSX metadata from {url}: {e}")
+        logging.error(f"Error extracting XLSX metadata from {path}: {e}")
         return {"Datum": "Unknown"}
 
 def filter_relevant_pages(pages):
@@ -171,8 +212,47 @@ def combine_metadata(sitemap_meta, file_meta):
 
 # --- Main Execution for Sitemap Files ---
 
-def main():
-    sitemap_url = "https://www.trafa.se/sitemap.xml"
+def process_page(page, base_download_folder):
+    """
+    Downloads a single sitemap file, extracts its metadata and stores it under
+    base_download_folder. Returns the combined metadata for the CSV output.
+    """
+    sitemap_meta = extract_sitemap_metadata(page)
+    file_url = sitemap_meta['url']
+    logging.info(f"Processing file: {file_url}")
+    
+    if file_url.lower().endswith('.pdf'):
+        file_type = "pdf"
+    elif file_url.lower().endswith('.xlsx'):
+        file_type = "xlsx"
+    else:
+        file_type = "other"
+
+    # Download once, then read the metadata from the local copy.
+    temp_path = download_file(file_url, os.path.join(base_download_folder, file_type))
+    if temp_path and file_type == "pdf":
+        file_meta = extract_pdf_metadata(temp_path)
+    elif temp_path and file_type == "xlsx":
+        file_meta = extract_xlsx_metadata(temp_path)
+    else:
+        file_meta = {"Datum": "Unknown"}
+    
+    combined_meta = combine_metadata(sitemap_meta, file_meta)
+    
+    # Use the extracted Datum to determine year for sorting. If unknown, use "unknown".
+    year = combined_meta['Datum'].split("-")[0] if combined_meta['Datum'] != "Unknown" else "unknown"
+    local_path = store_file(temp_path, file_url, base_download_folder, file_type, year) if temp_path else None
+    # Optionally, add the local file path to the metadata.
+    combined_meta["LocalPath"] = local_path
+    
+    logging.info(f"Extracted combined metadata: {combined_meta}")
+    return combined_meta
+
+def process_sitemap(sitemap_url, base_download_folder="trafa_downloads"):
+    """
+    Parses the sitemap, then downloads and extracts metadata for every PDF and XLSX
+    file it lists. Returns the list of combined metadata dicts in sitemap order.
+    """
     logging.info(f"Parsing sitemap: {sitemap_url}")
     
     tree = sitemap_tree_for_homepage(sitemap_url)
@@ -181,47 +261,33 @@ def main():
     
     relevant_pages = filter_relevant_pages(all_pages)
     logging.info(f"Filtered pages (only PDFs and XLSX): {len(relevant_pages)}")
-    
-    base_download_folder = "trafa_downloads"
-    metadata_list = []
-    
-    for page in relevant_pages:
-        sitemap_meta = extract_sitemap_metadata(page)
-        file_url = sitemap_meta['url']
-        logging.info(f"Processing file: {file_url}")
-        
-        if file_url.lower().endswith('.pdf'):
-            file_meta = extract_pdf_metadata(file_url)
-            file_type = "pdf"
-        elif file_url.lower().endswith('.xlsx'):
-            file_meta = extract_xlsx_metadata(file_url)
-            file_type = "xlsx"
-        else:
-            file_meta = {"Datum": "Unknown"}
-            file_type = "other"
-        
-        combined_meta = combine_metadata(sitemap_meta, file_meta)
-        
-        # Use the extracted Datum to determine year for sorting. If unknown, use "unknown".
-        year = combined_meta['Datum'].split("-")[0] if combined_meta['Datum'] != "Unknown" else "unknown"
-        local_path = download_file(file_url, base_download_folder, file_type, year)
-        # Optionally, add the local file path to the metadata.
-        combined_meta["LocalPath"] = local_path
-        
-        metadata_list.append(combined_meta)
-        logging.info(f"Extracted combined metadata: {combined_meta}")
-    
+
+    # The downloads are independent and I/O-bound, so process them on a thread pool
+    # that shares the pooled SESSION. map() keeps the sitemap order in the output.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        metadata_list = list(tqdm(
+            executor.map(partial(process_page, base_download_folder=base_download_folder), relevant_pages),
+            total=len(relevant_pages),
+            desc="Processing files",
+        ))
+    return metadata_list
+
+async def main():
+    sitemap_url = "https://www.trafa.se/sitemap.xml"
+    # Sitemap parsing and the thread pool block, so run them off the event loop
+    # to let other scrapers make progress concurrently.
+    metadata_list = await asyncio.to_thread(process_sitemap, sitemap_url)
+
     output_file = "trafa_sitemap_metadata.csv"
     try:
         with open(output_file, "w", newline="", encoding="utf-8") as f:
             fieldnames = ["Dokumentnamn", "Datum", "url", "LocalPath"]
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            for item in metadata_list:
-                writer.writerow(item)
+            writer.writerows(metadata_list)
         logging.info(f"Metadata written to {output_file}")
     except Exception as e:
         logging.error(f"Error writing CSV file: {e}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,3 +1,11 @@
+import os
+import random
+import itertools
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # List of user agent strings to simulate requests from different browsers and devices for web scraping.
 # This prevents bot detection by making the requests appear more human-like.
 USER_AGENTS = [
@@ -84,4 +92,47 @@ USER_AGENTS = [
     "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/94.0.4606.71 Mobile/15E148 Safari/604.1",
     "Mozilla/5.0 (iPhone; CPU iPhone OS 13_7 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/92.0.4515.159 Mobile/15E148 Safari/604.1",
     "Mozilla/5.0 (iPhone; CPU iPhone OS 12_4_7 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/88.0.4324.96 Mobile/15E148 Safari/604.1"
-]
\ No newline at end of file
+]
+
+
+# Number of requests sent with one user agent before a new one is picked.
+USER_AGENT_ROTATION = 50
+_request_counter = itertools.count(1)
+
+def rotate_user_agent(session):
+    """
+    Counts a request made with the given requests or aiohttp session and, every
+    USER_AGENT_ROTATION requests, swaps its default User-Agent header for a new random one.
+    """
+    if next(_request_counter) % USER_AGENT_ROTATION == 0:
+        session.headers["User-Agent"] = random.choice(USER_AGENTS)
+
+def create_session() -> requests.Session:
+    """
+    Builds a requests.Session with pooled, retrying connections so that repeated
+    requests to the same host reuse their TCP/TLS connection instead of paying a
+    fresh handshake each time. A user agent is picked once for the whole session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=50,
+        pool_maxsize=100,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = random.choice(USER_AGENTS)
+    return session
+
+
+# Directories already created by this process, so repeated downloads into the
+# same folder skip the makedirs stat/mkdir syscalls.
+_CREATED_DIRS = set()
+
+def ensure_dir(path: str):
+    """
+    Creates the directory (and any parents) unless this process already did so.
+    """
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
@@ -1,15 +1,17 @@
 import sys
 import asyncio
+import atexit
 import time
 import logging
 import os
 import re
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
-from bs4 import BeautifulSoup, Tag, NavigableString
-from tqdm import tqdm
-from playwright.async_api import async_playwright
+from lxml import etree, html as lxml_html
+from tqdm.asyncio import tqdm_asyncio
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from openpyxl import Workbook, load_workbook
 
 # Configure logging with timestamps.
@@ -19,39 +21,113 @@ logging.basicConfig(level=logging.DEBUG,
 CONTENT_TIMEOUT = 30000   # in milliseconds
 RETRY_COUNT = 3
 RETRY_DELAY = 1           # in seconds
+REPORT_CONCURRENCY = 8    # report pages loaded at the same time
+# Elements that show a page's content has rendered: the dated entries (or at least the
+# heading) of a listing page, and the title of a report page.
+LISTING_READY_SELECTOR = "time.lp-filterable-list-item-date, h1"
+REPORT_READY_SELECTOR = "h1"
+# Subresources the scraper never reads; they are aborted instead of downloaded.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
 DEBUG_HTML_DIR = "debug_html"
 os.makedirs(DEBUG_HTML_DIR, exist_ok=True)
 
+# Connection settings for bulk inserts: write-ahead logging with fewer fsyncs,
+# in-memory temp structures, a 64 MiB page cache and a wait instead of failing on locks.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "busy_timeout=5000",
+)
+
+# Column order of a report row, shared by the Excel sheet and the SQLite table.
+REPORT_COLUMNS = ("report_name", "diarienummer", "serienummer", "description", "date", "url")
+_INSERT_REPORT_SQL = (f"INSERT OR IGNORE INTO reports ({', '.join(REPORT_COLUMNS)}) "
+                      f"VALUES ({', '.join('?' * len(REPORT_COLUMNS))})")
+
 # Regex pattern to match dates in the format "26 februari 2025"
 date_pattern = re.compile(r'(\d{1,2}\s+\w+\s+\d{4})')
 
+# Report links on listing pages, and the report categories that are collected.
+_PUB_HREF_RE = re.compile(r"^/publikationer/")
+_CATEGORY_SET = frozenset({"rapport", "pm", "statistik", "wp"})
+
+# XPath expressions are compiled once at import and called with variables.
+# Whether an <h1>-<h3> heading mentions "Publikationer", which marks a listing page.
+_HAS_PUBLICATIONS_HEADER = etree.XPath(
+    "boolean(//*[self::h1 or self::h2 or self::h3][contains(., 'Publikationer')])")
+# Every text node outside <script> and <style>, in document order.
+_VISIBLE_TEXT = etree.XPath("//text()[not(parent::script or parent::style)]")
+# <div> elements whose class list contains $cls (passed padded with spaces).
+_FIND_DIV_WITH_CLASS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), $cls)]")
+
 async def add_cookie_removal_script(context):
+    """
+    Removes the cookie banner as soon as it is inserted into a page. A MutationObserver
+    only inspects the nodes that are added, instead of querying every div, p and span
+    of the finished document.
+    """
     await context.add_init_script(script="""
-        const removeCookieBanner = () => {
-            const selectors = ['div', 'p', 'span'];
-            selectors.forEach(selector => {
-                document.querySelectorAll(selector).forEach(el => {
-                    if (el.innerText && el.innerText.includes('Vi använder kakor')) {
-                        el.remove();
+        const needle = 'Vi använder kakor';
+        const removeAround = textNode => {
+            const parent = textNode.parentElement;
+            if (parent && parent.isConnected && parent.tagName !== 'SCRIPT' && parent.tagName !== 'STYLE') {
+                (parent.closest('div') || parent).remove();
+            }
+        };
+        const inspect = node => {
+            if (!node.textContent || !node.textContent.includes(needle)) {
+                return;
+            }
+            if (node.nodeType === Node.TEXT_NODE) {
+                removeAround(node);
+            } else if (node.nodeType === Node.ELEMENT_NODE) {
+                // Collect first, since removing a container would cut the walk short.
+                const matches = [];
+                const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+                for (let t = walker.nextNode(); t; t = walker.nextNode()) {
+                    if (t.data.includes(needle)) {
+                        matches.push(t);
                     }
-                });
-            });
+                }
+                matches.forEach(removeAround);
+            }
         };
-        if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', removeCookieBanner);
-        } else {
-            removeCookieBanner();
-        }
+        new MutationObserver(mutations => {
+            for (const mutation of mutations) {
+                mutation.addedNodes.forEach(inspect);
+            }
+        }).observe(document, {childList: true, subtree: true});
     """)
 
-async def get_html(page, url):
-    try:
-        await page.goto(url, timeout=CONTENT_TIMEOUT)
-        await page.wait_for_load_state("networkidle", timeout=CONTENT_TIMEOUT)
-        html = await page.content()
-        return html
-    except Exception as e:
-        raise e
+async def _route_request(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def block_heavy_resources(context):
+    """
+    Aborts image, media, font and stylesheet requests for every page in the context,
+    so only the documents and scripts that produce the HTML are fetched.
+    """
+    await context.route("**/*", _route_request)
+
+async def get_html(page, url, ready_selector=None):
+    """
+    Loads url and returns its HTML as soon as the DOM has been parsed, rather than
+    waiting for the network to go idle. If ready_selector is given, also waits for a
+    matching element; a page where it never appears is still returned so the caller
+    can decide what to do with it.
+    """
+    await page.goto(url, wait_until="domcontentloaded", timeout=CONTENT_TIMEOUT)
+    if ready_selector:
+        try:
+            await page.wait_for_selector(ready_selector, timeout=CONTENT_TIMEOUT)
+        except PlaywrightTimeoutError:
+            logging.warning(f"'{ready_selector}' did not appear on {url}")
+    return await page.content()
 
 async def get_report_html_alternative(browser, url, retries=RETRY_COUNT):
     for attempt in range(1, retries + 1):
@@ -77,97 +153,109 @@ async def get_report_html_alternative(browser, url, retries=RETRY_COUNT):
     logging.error(f"All {retries} attempts failed for {url}.")
     return ""
 
-def is_valid_listing_page(html):
-    soup = BeautifulSoup(html, "html.parser")
-    header = soup.find(lambda tag: tag.name in ['h1', 'h2', 'h3'] and "Publikationer" in tag.get_text())
-    return header is not None
+def _parse_html(html: str):
+    """
+    Parses an HTML string into an lxml document. Empty input yields an empty document
+    instead of raising, so lookups simply find nothing.
+    """
+    return lxml_html.document_fromstring(html if html.strip() else "<html></html>")
+
+def _text(element) -> str:
+    """
+    Returns the text of an lxml element with every text node stripped and joined,
+    matching bs4's get_text(strip=True).
+    """
+    return "".join(t.strip() for t in element.itertext())
+
+def is_valid_listing_page(tree):
+    return _HAS_PUBLICATIONS_HEADER(tree)
 
-def extract_report_links(listing_html):
+def extract_report_links(tree):
     """
     Extracts report URLs and their associated dates.
-    Iterates over all <time> elements with class "lp-filterable-list-item-date" and:
-      - Retrieves the date text.
-      - Uses find_previous to locate the closest <a> element with href starting with '/publikationer/'.
+    Walks all <a> and <time> elements once, in document order, remembering the most recent
+    <a> element with href starting with '/publikationer/'. Each <time> element with class
+    "lp-filterable-list-item-date" is paired with that anchor, which is the same anchor
+    find_previous would locate, without a backwards tree walk per date.
+    Takes the parsed listing page, so it shares one parse with is_valid_listing_page.
     Returns a list of dictionaries with 'url' and 'date' keys.
     """
-    soup = BeautifulSoup(listing_html, "html.parser")
     reports = []
-    time_tags = soup.select("time.lp-filterable-list-item-date")
-    logging.debug(f"Found {len(time_tags)} time tags on the page.")
-    for time_tag in time_tags:
-        date_str = time_tag.get_text(strip=True)
-        # Find the closest preceding <a> element with href starting with "/publikationer/"
-        link_tag = time_tag.find_previous("a", href=re.compile(r"^/publikationer/"))
-        if not link_tag:
-            logging.debug(f"No anchor found for time tag: {time_tag}")
+    seen = set()
+    link_tag = None
+    time_count = 0
+    for tag in tree.iter("a", "time"):
+        if tag.tag == "a":
+            if _PUB_HREF_RE.match(tag.get("href") or ""):
+                link_tag = tag
+            continue
+        if "lp-filterable-list-item-date" not in (tag.get("class") or "").split():
+            continue
+        time_count += 1
+        date_str = _text(tag)
+        if link_tag is None:
+            logging.debug(f"No anchor found for time tag: {date_str}")
             continue
         href = link_tag.get("href")
         if href:
             parts = href.split('/')
             if len(parts) > 2:
                 category = parts[2].lower()
-                if category in ["rapport", "pm", "statistik", "wp"]:
+                if category in _CATEGORY_SET:
                     full_url = href if href.startswith("http") else "https://www.tillvaxtanalys.se" + href
                     logging.debug(f"Extracted report: {full_url} with date: {date_str}")
-                    if not any(report["url"] == full_url for report in reports):
+                    if full_url not in seen:
+                        seen.add(full_url)
                         reports.append({"url": full_url, "date": date_str})
+    logging.debug(f"Found {time_count} time tags on the page.")
     logging.debug(f"Extracted {len(reports)} report links with dates: {reports}")
     return reports
 
+def _stripped_strings(tree) -> list:
+    """
+    Returns the non-blank visible text nodes of an lxml tree, stripped, like bs4's
+    stripped_strings.
+    """
+    return [t for t in (t.strip() for t in _VISIBLE_TEXT(tree)) if t]
 
-def _find_label_value(soup: BeautifulSoup, label_base: str) -> str:
+def _find_label_value(stripped: list, lowered: list, label_base: str) -> str:
     """
     Locate the text corresponding to a label like "Serienummer" or "Diarienummer",
     handling cases where the HTML may have:
       - 'Serienummer' on one line, then ':' on the next line, then the real value.
       - 'Serienummer:' and the value on the same stripped string.
       - 'Serienummer:' alone on one stripped string, then ':' alone, then the value.
+    stripped holds the page's stripped strings and lowered the same strings in lower
+    case; both are built once per report and shared by all label lookups.
     Approach:
-      1) Build a list of all stripped_strings.
-      2) For each index i where stripped[i] matches one of:
-         a) exactly label_base (e.g. "Serienummer")
-         b) starts with label_base + ":" (e.g. "Serienummer:")
-         do:
-           - If the same stripped string already contains text after "label_base:", return it.
-           - Otherwise, walk forward from i+1, skipping any stripped[j] that is exactly ":" (or empty),
-             and return the first stripped[j] that is neither ":" nor blank.
-      3) If no label is found at all, return None.
+      1) Find the first index i where lowered[i] is exactly label_base or starts with
+         label_base + ":".
+      2) If stripped[i] already contains a value after "label_base:", return it.
+      3) Otherwise walk forward from i+1, skipping any string that is exactly ":",
+         and return the first one that is not.
+      4) If no label is found at all, return None.
     """
     lb_lower = label_base.lower()
-    stripped = list(soup.stripped_strings)
+    lb_colon = lb_lower + ":"
     n = len(stripped)
 
-    for i, s in enumerate(stripped):
-        sl = s.strip()
-        slower = sl.lower()
-
-        # (1) Case A: exact label without colon (e.g. "Serienummer")
+    for i, slower in enumerate(lowered):
         if slower == lb_lower:
-            # Advance j until we find something other than just ":"
-            j = i + 1
-            while j < n and stripped[j].strip() == ":":
-                j += 1
-            if j < n:
-                return stripped[j].strip()
-            else:
-                return None
-
-        # (2) Case B: label with colon on same line (e.g. "Serienummer: Rapport 2024:xx")
-        if slower.startswith(lb_lower + ":"):
-            after = sl[len(label_base) + 1 :].strip()  # text after "Serienummer:"
+            pass
+        elif slower.startswith(lb_colon):
+            # Case B: label with colon on same line (e.g. "Serienummer: Rapport 2024:xx")
+            after = stripped[i][len(label_base) + 1 :].strip()  # text after "Serienummer:"
             if after and after != ":":
                 return after
-            # If the stripped string is exactly "Serienummer:" or ends with "Serienummer: :",
-            # we still need to move forward skipping any standalone ":".
-            j = i + 1
-            while j < n and stripped[j].strip() == ":":
-                j += 1
-            if j < n:
-                return stripped[j].strip()
-            else:
-                return None
+        else:
+            continue
+
+        # Case A, or "Serienummer:" without a value: take the next string that is not just ":".
+        j = i + 1
+        while j < n and stripped[j] == ":":
+            j += 1
+        return stripped[j] if j < n else None
 
-    # (3) If we reach here, neither pattern was found
     return None
 
 
@@ -179,28 +267,31 @@ def parse_report(report_html: str) -> dict:
       - serienummer (e.g. "Rapport 2024:17")
       - diarienummer (e.g. "2021/68")
       - description (combined text from .rapport-description or all <p> tags)
+    The page is parsed once with lxml and all lookups run against that tree.
     """
-    soup = BeautifulSoup(report_html, "html.parser")
+    tree = _parse_html(report_html)
 
     # 1) Report name (the page’s <h1>)
-    h1 = soup.find("h1")
-    report_name = h1.get_text(strip=True) if h1 else None
+    h1 = tree.find(".//h1")
+    report_name = _text(h1) if h1 is not None else None
 
     # 2) Serienummer & Diarienummer
-    serienummer = _find_label_value(soup, "Serienummer")
-    diarienummer = _find_label_value(soup, "Diarienummer")
+    stripped = _stripped_strings(tree)
+    lowered = [t.lower() for t in stripped]
+    serienummer = _find_label_value(stripped, lowered, "Serienummer")
+    diarienummer = _find_label_value(stripped, lowered, "Diarienummer")
 
     # 3) Description
-    desc_container = soup.find("div", class_="rapport-description")
+    desc_container = _FIND_DIV_WITH_CLASS(tree, cls=" rapport-description ")
     if desc_container:
-        description = desc_container.get_text(separator=" ", strip=True)
+        description = " ".join(t.strip() for t in desc_container[0].itertext() if t.strip())
     else:
-        article_container = soup.find("div", class_="rapport-article-content")
+        article_container = _FIND_DIV_WITH_CLASS(tree, cls=" rapport-article-content ")
         if article_container:
-            paragraphs = article_container.find_all("p")
+            paragraphs = article_container[0].iter("p")
         else:
-            paragraphs = soup.find_all("p")
-        description = " ".join([p.get_text(strip=True) for p in paragraphs])
+            paragraphs = tree.iter("p")
+        description = " ".join([_text(p) for p in paragraphs])
 
     return {
         "report_name": report_name,
@@ -213,136 +304,226 @@ def parse_report(report_html: str) -> dict:
 
 
 
-def save_to_excel(reports_data, filename="reports.xlsx"):
+def save_to_excel(rows, filename="reports.xlsx"):
+    """
+    Writes report rows (tuples in REPORT_COLUMNS order) to the Excel file, appending
+    only rows whose URL is not already in it.
+    """
     if os.path.exists(filename):
+        # Collect the stored URLs with the streaming read-only reader, and only load the
+        # full workbook for writing when there is something new to append.
+        wb_ro = load_workbook(filename, read_only=True, data_only=True)
+        try:
+            existing_urls = {row[-1] for row in wb_ro.active.iter_rows(min_row=2, values_only=True)
+                             if row and row[-1]}
+        finally:
+            wb_ro.close()
+        new_rows = []
+        for row in rows:
+            if row[-1] not in existing_urls:
+                existing_urls.add(row[-1])
+                new_rows.append(row)
+        if not new_rows:
+            logging.info(f"No new reports to add to Excel file: {filename}")
+            return
         wb = load_workbook(filename)
         ws = wb.active
-        existing_urls = set()
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[-1]:
-                existing_urls.add(row[-1])
-        for report in reports_data:
-            if report.get("url") not in existing_urls:
-                row = [
-                    report.get("report_name"),
-                    report.get("diarienummer"),
-                    report.get("serienummer"),
-                    report.get("description"),
-                    report.get("date"),
-                    report.get("url"),
-                ]
-                ws.append(row)
+        for row in new_rows:
+            ws.append(row)
         wb.save(filename)
         logging.info(f"Updated existing Excel file: {filename}")
     else:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Reports"
-        headers = ["report_name", "diarienummer", "serienummer", "description", "date", "url"]
-        ws.append(headers)
-        for report in reports_data:
-            row = [
-                report.get("report_name"),
-                report.get("diarienummer"),
-                report.get("serienummer"),
-                report.get("description"),
-                report.get("date"),
-                report.get("url"),
-            ]
+        # A write-only workbook streams the rows out on save instead of keeping cell objects.
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Reports")
+        ws.append(REPORT_COLUMNS)
+        for row in rows:
             ws.append(row)
         wb.save(filename)
         logging.info(f"Created new Excel file: {filename}")
 
-def save_to_sqlite(reports_data, db_filename="reports.db"):
-    conn = sqlite3.connect(db_filename)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS reports (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            report_name TEXT,
-            diarienummer TEXT,
-            serienummer TEXT,
-            description TEXT,
-            date TEXT,
-            url TEXT UNIQUE
-        )
-    """)
-    for report in reports_data:
-        try:
-            cursor.execute("""
-                INSERT INTO reports (report_name, diarienummer, serienummer, description, date, url)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                report.get("report_name"),
-                report.get("diarienummer"),
-                report.get("serienummer"),
-                report.get("description"),
-                report.get("date"),
-                report.get("url"),
-            ))
-        except sqlite3.IntegrityError:
-            logging.info(f"Skipping duplicate entry for URL: {report.get('url')}")
-    conn.commit()
-    conn.close()
-    logging.info(f"Saved data to SQLite database: {db_filename}")
-
-async def fetch_listing_pages(listing_url):
-    all_listing_htmls = []
-    async with async_playwright() as p:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            context = await p.chromium.launch_persistent_context(
-                temp_dir,
-                headless=True,
-                args=["--headless=new"],
+# Open SQLite connections by database file. They are reused by every save_to_sqlite
+# call, which may run in different worker threads, so access goes through the lock.
+_DB_CONNECTIONS = {}
+_DB_LOCK = threading.Lock()
+
+def _db(db_filename):
+    """
+    Returns the connection for db_filename, opening it, applying the pragmas and
+    creating the table on first use. The connection is in autocommit mode, so
+    transactions are begun explicitly, and stays open until the process exits.
+    """
+    conn = _DB_CONNECTIONS.get(db_filename)
+    if conn is None:
+        conn = sqlite3.connect(db_filename, isolation_level=None, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                report_name TEXT,
+                diarienummer TEXT,
+                serienummer TEXT,
+                description TEXT,
+                date TEXT,
+                url TEXT UNIQUE
             )
-            await context.add_cookies([{
-                "name": "CONSENT",
-                "value": "YES+",
-                "domain": ".tillvaxtanalys.se",
-                "path": "/"
-            }])
-            await add_cookie_removal_script(context)
-            page = await context.new_page()
+        """)
+        _DB_CONNECTIONS[db_filename] = conn
+    return conn
+
+def _close_db_connections():
+    with _DB_LOCK:
+        for conn in _DB_CONNECTIONS.values():
+            conn.close()
+        _DB_CONNECTIONS.clear()
+
+atexit.register(_close_db_connections)
+
+def save_to_sqlite(rows, db_filename="reports.db"):
+    """
+    Inserts report rows (tuples in REPORT_COLUMNS order) into the SQLite database,
+    skipping URLs that are already stored.
+    """
+    with _DB_LOCK:
+        conn = _db(db_filename)
+        cursor = conn.cursor()
+        # Insert the whole batch in one transaction; OR IGNORE lets the UNIQUE(url)
+        # constraint skip reports that are already stored. The connection's statement
+        # cache keeps the INSERT prepared between calls.
+        cursor.execute("BEGIN")
+        with conn:
+            cursor.executemany(_INSERT_REPORT_SQL, rows)
+        inserted = cursor.rowcount
+    if inserted < len(rows):
+        logging.info(f"Skipped {len(rows) - inserted} duplicate entries already in {db_filename}")
+    logging.info(f"Saved {inserted} new reports to SQLite database: {db_filename}")
+
+async def iter_listing_pages(context, listing_url):
+    """
+    Walks the paginated listing and yields the report entries of each page as soon as
+    it has been read, so no listing HTML is kept once its links are extracted.
+    """
+    page = await context.new_page()
+    try:
+        current_page = 1
+        while True:
+            if current_page == 1:
+                paginated_url = listing_url
+            else:
+                paginated_url = listing_url + f"&svAjaxReqParam=ajax&page12_706c70df1932999ea346c0a={current_page}"
+            logging.info(f"Fetching listing page: {paginated_url}")
+            html = await get_html(page, paginated_url, LISTING_READY_SELECTOR)
+            tree = _parse_html(html)
+            if not is_valid_listing_page(tree):
+                logging.warning(f"'Publikationer' not found on {paginated_url}. Assuming last page reached.")
+                break
+            if not html or len(html) < 1000:
+                logging.warning(f"Received empty or too short content for {paginated_url}. Assuming no more pages.")
+                break
+            report_links = extract_report_links(tree)
+            if len(report_links) < 1:
+                logging.info("Less than expected reports on this page, assuming last page.")
+                break
+            yield report_links
+            current_page += 1
+            await asyncio.sleep(0.5)
+    finally:
+        await page.close()
+
+async def fetch_report(page, entry):
+    """
+    Loads and parses one report page on the given tab. Returns the report as a row in
+    REPORT_COLUMNS order, or None if the page could not be processed.
+    """
+    url = entry.get("url")
+    list_date = entry.get("date")
+    logging.debug(f"Processing report with URL: {url} and listing date: {list_date}")
+    try:
+        html = await get_html(page, url, REPORT_READY_SELECTOR)
+        if len(html) < 1000:
+            debug_file = os.path.join(DEBUG_HTML_DIR, url.split("/")[-1] + ".html")
+            with open(debug_file, "w", encoding="utf-8") as f:
+                f.write(html)
+            logging.warning(f"Content for {url} is very short. Saved HTML to {debug_file}")
+        data = parse_report(html)
+        row = (
+            data["report_name"],
+            data["diarienummer"],
+            data["serienummer"],
+            data["description"],
+            list_date,  # Use the date from the listing
+            url,
+        )
+        logging.debug(f"Completed processing report: {row}")
+        return row
+    except Exception as e:
+        logging.error(f"Error processing {url}: {e}")
+        return None
+
+async def _close_page(page):
+    try:
+        await page.close()
+    except Exception as close_e:
+        logging.error(f"Error closing report page: {close_e}")
+
+async def _report_worker(context, queue, results, progress):
+    """
+    Opens one tab and keeps navigating it to the next queued report until the queue
+    is empty, storing each result at the report's index. A tab that cannot be opened
+    only fails the report it was opened for; the next report tries again. After a
+    failed report the tab is discarded, since Playwright keeps a crashed or hung tab
+    open, and the next report gets a fresh one.
+    """
+    page = None
+    try:
+        while True:
             try:
-                current_page = 1
-                while True:
-                    if current_page == 1:
-                        paginated_url = listing_url
-                    else:
-                        paginated_url = listing_url + f"&svAjaxReqParam=ajax&page12_706c70df1932999ea346c0a={current_page}"
-                    logging.info(f"Fetching listing page: {paginated_url}")
-                    html = await get_html(page, paginated_url)
-                    if not is_valid_listing_page(html):
-                        logging.warning(f"'Publikationer' not found on {paginated_url}. Assuming last page reached.")
-                        break
-                    if not html or len(html) < 1000:
-                        logging.warning(f"Received empty or too short content for {paginated_url}. Assuming no more pages.")
-                        break
-                    all_listing_htmls.append(html)
-                    report_links = extract_report_links(html)
-                    if len(report_links) < 1:
-                        logging.info("Less than expected reports on this page, assuming last page.")
-                        break
-                    current_page += 1
-                    await asyncio.sleep(0.5)
-            finally:
-                await page.close()
-                await context.close()
-    return all_listing_htmls
+                index, entry = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                if page is None or page.is_closed():
+                    page = await context.new_page()
+            except Exception as e:
+                logging.error(f"Error opening a page for {entry.get('url')}: {e}")
+                page = None
+            else:
+                results[index] = await fetch_report(page, entry)
+                if results[index] is None:
+                    await _close_page(page)
+                    page = None
+            progress.update()
+            # Keep a short pause per tab so the site sees a steady, bounded request rate.
+            await asyncio.sleep(0.5)
+    finally:
+        if page is not None:
+            await _close_page(page)
+
+async def fetch_reports(context, report_entries):
+    """
+    Fetches and parses all report pages on a pool of at most REPORT_CONCURRENCY tabs,
+    which take reports from a shared queue and are reused for every report they load.
+    Returns the report rows in listing order, leaving out those that failed.
+    """
+    queue = asyncio.Queue()
+    for item in enumerate(report_entries):
+        queue.put_nowait(item)
+    results = [None] * len(report_entries)
+    worker_count = min(REPORT_CONCURRENCY, len(report_entries))
+    with tqdm_asyncio(total=len(report_entries), desc="Processing reports") as progress:
+        await asyncio.gather(*(_report_worker(context, queue, results, progress)
+                               for _ in range(worker_count)))
+    return [row for row in results if row is not None]
 
 async def main():
     listing_url = ("https://www.tillvaxtanalys.se/publikationer.109.html?"
                    "sv.target=12.706c70df1932999ea346c0a&"
                    "sv.12c70df1932999ea346c0a.route=/&"
                    "query=&from=2000-01-01&to=2025-01-01")
-    logging.info(f"Fetching listing pages from: {listing_url}")
-    listing_htmls = await fetch_listing_pages(listing_url)
-    
-    report_entries = []
-    for html in listing_htmls:
-        report_entries.extend(extract_report_links(html))
-    logging.info(f"Found {len(report_entries)} report entries: {report_entries}")
-    
+
+    # One browser context serves both the listing and the report phase, so Chromium
+    # is launched and the consent cookie and init script are set up only once.
     async with async_playwright() as p:
         with tempfile.TemporaryDirectory() as temp_dir:
             context = await p.chromium.launch_persistent_context(
@@ -350,44 +531,40 @@ async def main():
                 headless=True,
                 args=["--headless=new"],
             )
-            await context.add_cookies([{
-                "name": "CONSENT",
-                "value": "YES+",
-                "domain": ".tillvaxtanalys.se",
-                "path": "/"
-            }])
-            await add_cookie_removal_script(context)
-            
-            reports_data = []
-            for entry in tqdm(report_entries, desc="Processing reports"):
-                url = entry.get("url")
-                list_date = entry.get("date")
-                logging.debug(f"Processing report with URL: {url} and listing date: {list_date}")
-                try:
-                    page = await context.new_page()
-                    html = await get_html(page, url)
-                    if len(html) < 1000:
-                        debug_file = os.path.join(DEBUG_HTML_DIR, url.split("/")[-1] + ".html")
-                        with open(debug_file, "w", encoding="utf-8") as f:
-                            f.write(html)
-                        logging.warning(f"Content for {url} is very short. Saved HTML to {debug_file}")
-                    data = parse_report(html)
-                    data["url"] = url
-                    data["date"] = list_date  # Use the date from the listing
-                    reports_data.append(data)
-                    logging.debug(f"Completed processing report: {data}")
-                    await page.close()
-                except Exception as e:
-                    logging.error(f"Error processing {url}: {e}")
-                await asyncio.sleep(0.5)
-            await context.close()
+            try:
+                await context.add_cookies([{
+                    "name": "CONSENT",
+                    "value": "YES+",
+                    "domain": ".tillvaxtanalys.se",
+                    "path": "/"
+                }])
+                await add_cookie_removal_script(context)
+                await block_heavy_resources(context)
+
+                logging.info(f"Fetching listing pages from: {listing_url}")
+                # Keyed by URL, so a report listed on several pages is fetched only once
+                # (with the date from the first page it appeared on).
+                entries_by_url = {}
+                async for report_links in iter_listing_pages(context, listing_url):
+                    for entry in report_links:
+                        entries_by_url.setdefault(entry["url"], entry)
+                report_entries = list(entries_by_url.values())
+                logging.info(f"Found {len(report_entries)} report entries: {report_entries}")
+
+                report_rows = await fetch_reports(context, report_entries)
+            finally:
+                await context.close()
     
     logging.info("Final Report Data:")
-    for report in reports_data:
-        logging.info(report)
+    for row in report_rows:
+        logging.info(row)
     
-    save_to_excel(reports_data)
-    save_to_sqlite(reports_data)
+    # Both writers block on disk I/O and touch separate files, so run them side by side
+    # in worker threads instead of one after the other on the event loop.
+    await asyncio.gather(
+        asyncio.to_thread(save_to_excel, report_rows),
+        asyncio.to_thread(save_to_sqlite, report_rows),
+    )
 
 if __name__ == "__main__":
     asyncio.run(main())